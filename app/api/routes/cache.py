@@ -0,0 +1,45 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+
+from app.config import get_settings
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/cache/invalidate",
+    summary="Invalidate recommendation caches",
+    description="Drop cached recommendations and product embeddings, e.g. after the catalog is re-embedded"
+)
+async def invalidate_cache(
+    request: Request,
+    x_cache_invalidation_token: Optional[str] = Header(None)
+):
+    """
+    API endpoint to invalidate the in-process caches.
+    
+    Called by the embedding pipeline once new embeddings have been saved.
+    Requires the X-Cache-Invalidation-Token header to match the configured
+    CACHE_INVALIDATION_TOKEN; the endpoint is disabled when none is configured.
+    
+    Returns:
+        Status of the invalidation
+    """
+    expected_token = get_settings().cache_invalidation_token
+    
+    if not expected_token:
+        raise HTTPException(status_code=403, detail="Cache invalidation is disabled")
+    
+    if x_cache_invalidation_token is None or not secrets.compare_digest(
+        x_cache_invalidation_token.encode(),
+        expected_token.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid cache invalidation token")
+    
+    request.app.state.recommendation_cache.clear()
+    request.app.state.product_repo.clear_cache()
+    
+    return {"status": "ok"}
@@ -1,31 +1,41 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
 from app.domain.entities.recommendation import Recommendations
+from app.domain.repositories.product_repository import ProductRepository
 from app.application.use_cases.get_product_recommendations import GetProductRecommendationsUseCase
-from app.infrastructure.repositories.qdrant_product_repository import QdrantProductRepository
 from app.config import get_settings
 
 
 router = APIRouter()
 
 
-def get_product_repository():
-    """Dependency for product repository"""
-    return QdrantProductRepository()
+async def get_product_repository(request: Request):
+    """Dependency for the app-wide product repository built once at startup.
+    
+    Returns the batch coalescer wrapping app.state.product_repo so concurrent
+    searches can be batched.
+    """
+    return request.app.state.batch_coalescer
 
 
-def get_recommendations_use_case(
-    product_repository: QdrantProductRepository = Depends(get_product_repository)
+async def get_recommendations_use_case(
+    request: Request,
+    product_repository: ProductRepository = Depends(get_product_repository)
 ):
     """Dependency for product recommendations use case"""
-    return GetProductRecommendationsUseCase(product_repository)
+    return GetProductRecommendationsUseCase(
+        product_repository,
+        recommendation_cache=request.app.state.recommendation_cache
+    )
 
 
 @router.get(
     "/get-recommendation",
-    response_model=Recommendations,
+    response_class=ORJSONResponse,
+    responses={200: {"model": Recommendations}},
     summary="Get similar product recommendations",
     description="Get similar products to the given product ID within the same sub-category"
 )
@@ -42,12 +52,15 @@ async def get_recommendation(
         limit: Maximum number of recommendations to return (default from settings)
         
     Returns:
-        Recommendations object with similar products
+        ORJSONResponse with the recommendations payload, serialized without
+        re-validating it through the Recommendations model
     """
-    settings = get_settings()
-    limit = limit or settings.default_recommendation_limit
+    if limit is None:
+        # Read per request: get_settings() is cached, and reading it at import would
+        # capture settings before the environment's .env file is loaded
+        limit = get_settings().default_recommendation_limit
     
-    if limit is not None and limit <= 0:
+    if limit <= 0:
         raise HTTPException(status_code=400, detail="Limit must be greater than 0")
     
     recommendations = await use_case.execute(product_id=product_id, limit=limit)
@@ -55,4 +68,4 @@ async def get_recommendation(
     if recommendations is None:
         raise HTTPException(status_code=404, detail=f"Product with ID {product_id} not found")
     
-    return recommendations 
\ No newline at end of file
+    return ORJSONResponse(recommendations) 
\ No newline at end of file
@@ -1,17 +1,21 @@
-from typing import List, Optional
+from typing import Any, Dict, Optional
 
-from app.domain.entities.product import Product
-from app.domain.entities.recommendation import ProductRecommendation, Recommendations
+from app.domain.cache.async_cache import AsyncCache
 from app.domain.repositories.product_repository import ProductRepository
 
 
 class GetProductRecommendationsUseCase:
     """Use case for getting product recommendations"""
     
-    def __init__(self, product_repository: ProductRepository):
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        recommendation_cache: Optional[AsyncCache] = None
+    ):
         self.product_repository = product_repository
+        self.recommendation_cache = recommendation_cache
     
-    async def execute(self, product_id: str, limit: int = 5) -> Optional[Recommendations]:
+    async def execute(self, product_id: str, limit: int = 5) -> Optional[Dict[str, Any]]:
         """
         Execute the use case to get product recommendations
         
@@ -20,8 +24,19 @@ class GetProductRecommendationsUseCase:
             limit: The maximum number of recommendations to return
             
         Returns:
-            Recommendations object containing similar products, or None if product not found
+            Recommendations payload ({"results": [{"product": ..., "distance": ...}]})
+            ready for serialization, or None if product not found
         """
+        if self.recommendation_cache is None:
+            return await self._recommend(product_id, limit)
+        
+        return await self.recommendation_cache.get_or_load(
+            (product_id, limit),
+            lambda: self._recommend(product_id, limit)
+        )
+    
+    async def _recommend(self, product_id: str, limit: int) -> Optional[Dict[str, Any]]:
+        """Build recommendations for a product from the repository"""
         product = await self.product_repository.get_product_by_id(product_id)
         if not product:
             return None
@@ -31,18 +46,4 @@ class GetProductRecommendationsUseCase:
             limit=limit
         )
         
-        results = []
-        for product, distance in similar_products:
-            results.append(
-                ProductRecommendation(
-                    product={
-                        "product_id": product.product_id,
-                        "category": product.main_category,
-                        "sub_category": product.sub_category,
-                        "price": product.price_usd,
-                    },
-                    distance=distance
-                )
-            )
-        
-        return Recommendations(results=results) 
\ No newline at end of file
+        return {"results": similar_products} 
\ No newline at end of file
@@ -17,11 +17,16 @@ class Settings(BaseSettings):
     # API settings
     api_host: str = Field(default="0.0.0.0", env="API_HOST")
     api_port: int = Field(default=8000, env="API_PORT")
+    api_url: str = Field(default="http://localhost:8000", env="API_URL")
     
     # Qdrant settings
     qdrant_host: str = Field(default="localhost", env="QDRANT_HOST") 
     qdrant_port: int = Field(default=6333, env="QDRANT_PORT")
+    qdrant_grpc_port: int = Field(default=6334, env="QDRANT_GRPC_PORT")
+    qdrant_prefer_grpc: bool = Field(default=True, env="QDRANT_PREFER_GRPC")
     qdrant_collection: str = Field(default="products", env="QDRANT_COLLECTION")
+    qdrant_upsert_batch_size: int = Field(default=256, env="QDRANT_UPSERT_BATCH_SIZE")
+    qdrant_upsert_concurrency: int = Field(default=4, env="QDRANT_UPSERT_CONCURRENCY")
     
     # Embedding model settings
     embedding_model: str = Field(default="all-MiniLM-L6-v2", env="EMBEDDING_MODEL")
@@ -36,6 +41,16 @@ class Settings(BaseSettings):
     default_recommendation_limit: int = Field(default=5, env="DEFAULT_RECOMMENDATION_LIMIT")
     distance_threshold: float = Field(default=0.95, env="DISTANCE_THRESHOLD")
     
+    # Caching settings
+    product_cache_size: int = Field(default=10000, env="PRODUCT_CACHE_SIZE")
+    recommendation_cache_size: int = Field(default=50000, env="RECOMMENDATION_CACHE_SIZE")
+    recommendation_cache_ttl: int = Field(default=3600, env="RECOMMENDATION_CACHE_TTL")
+    cache_invalidation_token: Optional[str] = Field(default=None, env="CACHE_INVALIDATION_TOKEN")
+    
+    # Search batching settings
+    search_batch_max_size: int = Field(default=64, env="SEARCH_BATCH_MAX_SIZE")
+    search_batch_wait_ms: float = Field(default=3.0, env="SEARCH_BATCH_WAIT_MS")
+    
     class Config:
         """Pydantic configuration."""
         env_file = ".env"
@@ -0,0 +1 @@
+"""Domain cache module"""
\ No newline at end of file
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class AsyncCache(ABC):
+    """Interface for caches that load missing values asynchronously"""
+    
+    @abstractmethod
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """Get a cached value, loading it with the given coroutine factory on a miss"""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.domain.entities.product import Product
 
@@ -28,6 +28,18 @@ class ProductRepository(ABC):
         product_id: str, 
         limit: int = 5, 
         distance_threshold: float = 0.95
-    ) -> List[tuple[Product, float]]:
-        """Find similar products to the given product ID with similarity scores"""
-        pass 
\ No newline at end of file
+    ) -> List[Dict[str, Any]]:
+        """Find similar products to the given product ID with similarity scores.
+        
+        Each result is a recommendation dict of the form
+        {"product": {"product_id", "category", "sub_category", "price"}, "distance": score}.
+        """
+        pass
+    
+    @abstractmethod
+    async def find_similar_products_batch(
+        self,
+        queries: List[Tuple[str, int]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Find similar products for several (product_id, limit) queries at once"""
+        pass
\ No newline at end of file
@@ -1,12 +1,15 @@
 import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Dict
 
+import httpx
 import pandas as pd
 import numpy as np
 from prefect import flow, task
 from sentence_transformers import SentenceTransformer
 
+from app.config import get_settings
 from app.domain.entities.product import Product
 from app.infrastructure.repositories.qdrant_product_repository import QdrantProductRepository
 
@@ -27,6 +30,28 @@ def get_model_path(model_name: str = "all-MiniLM-L6-v2") -> str:
     return model_name
 
 
+_models: Dict[str, SentenceTransformer] = {}
+_models_lock = threading.Lock()
+
+
+def get_embedding_model(model_name: str = None) -> SentenceTransformer:
+    """Get the embedding model, loading it only once per process"""
+    if model_name is None:
+        model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    
+    with _models_lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = SentenceTransformer(get_model_path(model_name))
+            
+            if model.device.type == "cuda":
+                model.half()
+            
+            _models[model_name] = model
+    
+    return model
+
+
 @task(name="Read Products Data")
 def read_products_data(csv_path: str) -> pd.DataFrame:
     """Read products data from CSV file"""
@@ -38,76 +63,66 @@ def read_products_data(csv_path: str) -> pd.DataFrame:
     return df
 
 
-def convert_price_to_usd(price_str: str, exchange_rate: float = 0.035) -> str:
+def convert_prices_to_usd(prices: pd.Series, exchange_rate: float = 0.035) -> pd.Series:
     """
-    Convert price from Thai Baht to USD.
+    Convert prices from Thai Baht to USD.
     
     Args:
-        price_str: Price string in Thai Baht format (e.g. ฿7,999)
+        prices: Price strings in Thai Baht format (e.g. ฿7,999)
         exchange_rate: Exchange rate from THB to USD (default: 0.035)
         
     Returns:
-        Price string in USD format (e.g. $279.97)
+        Price strings in USD format (e.g. $279.97); prices that cannot be
+        parsed are returned unchanged
     """
-    try:
-        price_str = price_str.replace('฿', '').replace(',', '')
-        price_thb = float(price_str)
-        
-        price_usd = price_thb * exchange_rate
-        return f"${price_usd:.2f}"
-    except (ValueError, AttributeError):
-        return price_str
+    cleaned = prices.str.replace('฿', '', regex=False).str.replace(',', '', regex=False)
+    prices_usd = pd.to_numeric(cleaned, errors="coerce") * exchange_rate
+    
+    return prices_usd.map("${:.2f}".format, na_action="ignore").fillna(prices)
 
 
 @task(name="Create Text Embeddings")
 def create_embeddings(
     df: pd.DataFrame, 
     model_name: str = None
-) -> List[Dict[str, Any]]:
-    """Create text embeddings for products"""
-    if model_name is None:
-        model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-    
-    model_path = get_model_path(model_name)
-    
-    model = SentenceTransformer(model_path)
-    
-    products_with_embeddings = []
-    
-    for _, row in df.iterrows():
-        text = f"{row['product_name']}. Category: {row['main_category']}. Sub-category: {row['sub_category']}"
-        
-        embedding = model.encode(text).tolist()
-        
-        product_dict = row.to_dict()
-        product_dict["embedding"] = embedding
-        
-        product_dict["price_usd"] = convert_price_to_usd(product_dict["price"])
-        
-        if pd.isna(product_dict["no_of_ratings"]):
-            product_dict["no_of_ratings"] = None
-        else:
-            try:
-                product_dict["no_of_ratings"] = int(product_dict["no_of_ratings"])
-            except (ValueError, TypeError):
-                product_dict["no_of_ratings"] = None
-        
-        if pd.isna(product_dict["ratings"]):
-            product_dict["ratings"] = None
-            
-        products_with_embeddings.append(product_dict)
-    
-    return products_with_embeddings
+) -> pd.DataFrame:
+    """Create text embeddings for products, returned as an `embedding` column of arrays"""
+    model = get_embedding_model(model_name)
+    
+    texts = (
+        df["product_name"].astype(str)
+        + ". Category: " + df["main_category"].astype(str)
+        + ". Sub-category: " + df["sub_category"].astype(str)
+    ).tolist()
+    
+    embeddings = model.encode(
+        texts,
+        batch_size=64,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=True
+    )
+    
+    return df.assign(
+        embedding=list(embeddings),
+        price_usd=convert_prices_to_usd(df["price"]),
+        no_of_ratings=np.trunc(df["no_of_ratings"]).astype("Int64")
+    )
 
 
 @task(name="Save to Vector Database")
-async def save_to_vector_db(products_data: List[Dict[str, Any]]) -> None:
+async def save_to_vector_db(df: pd.DataFrame) -> None:
     """Save products with embeddings to Qdrant vector database"""
     repository = QdrantProductRepository()
+    repository.ensure_collection_exists()
+    
+    rows = df.astype(object).where(df.notna(), None)
     
     products = []
-    for prod in products_data:
+    for row in rows.itertuples(index=False):
+        prod = row._asdict()
         try:
+            prod["embedding"] = prod["embedding"].tolist()
             products.append(Product.from_dict(prod))
         except Exception as e:
             print(f"Error creating Product from data: {e}")
@@ -117,10 +132,8 @@ async def save_to_vector_db(products_data: List[Dict[str, Any]]) -> None:
 
 
 @task(name="Save Daily Snapshot")
-def save_daily_snapshot(products_data: List[Dict[str, Any]]) -> str:
+def save_daily_snapshot(df: pd.DataFrame) -> str:
     """Save daily snapshot of products with embeddings in parquet format"""
-    df = pd.DataFrame(products_data)
-    
     snapshot_dir = os.path.join("snapshots")
     os.makedirs(snapshot_dir, exist_ok=True)
     
@@ -129,11 +142,32 @@ def save_daily_snapshot(products_data: List[Dict[str, Any]]) -> str:
     os.makedirs(partition_dir, exist_ok=True)
     
     parquet_path = os.path.join(partition_dir, "products.parquet")
-    df.to_parquet(parquet_path, index=False)
+    df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
     
     return parquet_path
 
 
+@task(name="Invalidate Recommendation Cache")
+def invalidate_recommendation_cache() -> None:
+    """Ask the recommendation API to drop responses computed from the previous embeddings"""
+    settings = get_settings()
+    url = f"{settings.api_url}/cache/invalidate"
+    
+    if not settings.cache_invalidation_token:
+        print("CACHE_INVALIDATION_TOKEN is not set; skipping recommendation cache invalidation")
+        return
+    
+    try:
+        response = httpx.post(
+            url,
+            headers={"X-Cache-Invalidation-Token": settings.cache_invalidation_token},
+            timeout=10
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Error invalidating recommendation cache at {url}: {e}")
+
+
 @flow(name="Products Embedding Pipeline")
 async def product_embedding_pipeline(csv_path: str = "data/products.csv", model_name: str = None):
     """
@@ -142,6 +176,7 @@ async def product_embedding_pipeline(csv_path: str = "data/products.csv", model_
     2. Create text embeddings
     3. Save to vector database
     4. Save daily snapshot as parquet
+    5. Invalidate the recommendation API cache
     
     Args:
         csv_path: Path to the products CSV file
@@ -149,11 +184,13 @@ async def product_embedding_pipeline(csv_path: str = "data/products.csv", model_
     """
     df = read_products_data(csv_path)
     
-    products_with_embeddings = create_embeddings(df, model_name=model_name)
+    products_df = create_embeddings(df, model_name=model_name)
+    
+    await save_to_vector_db(products_df)
     
-    await save_to_vector_db(products_with_embeddings)
+    snapshot_path = save_daily_snapshot(products_df)
     
-    snapshot_path = save_daily_snapshot(products_with_embeddings)
+    invalidate_recommendation_cache()
     
     print(f"Pipeline completed successfully. Snapshot saved to {snapshot_path}")
     return snapshot_path
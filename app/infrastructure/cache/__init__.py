@@ -0,0 +1 @@
+"""Infrastructure cache module"""
\ No newline at end of file
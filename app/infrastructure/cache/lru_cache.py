@@ -0,0 +1,92 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.domain.cache.async_cache import AsyncCache
+
+
+_MISSING = object()
+
+
+class AsyncLRUCache(AsyncCache):
+    """Bounded in-process LRU cache with per-key locking for async loaders"""
+    
+    def __init__(self, maxsize: int):
+        """Initialize the cache; a maxsize of 0 disables caching"""
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._waiters: Dict[Hashable, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, marking it as most recently used"""
+        if key not in self._data:
+            return default
+        
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        
+        self._data[key] = value
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry from the cache"""
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        self._data.clear()
+    
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """
+        Get a cached value, loading it on a miss.
+        
+        Concurrent misses for the same key wait on a shared lock so the loader
+        runs once. None results are returned but not cached.
+        
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value on a miss
+        
+        Returns:
+            The cached or freshly loaded value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                
+                value = await loader()
+                if value is not None:
+                    self.set(key, value)
+                return value
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
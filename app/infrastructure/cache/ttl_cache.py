@@ -0,0 +1,26 @@
+from typing import Any, Hashable
+
+from cachetools import TTLCache
+
+from app.infrastructure.cache.lru_cache import AsyncLRUCache
+
+
+class AsyncTTLCache(AsyncLRUCache):
+    """AsyncLRUCache whose entries also expire after a fixed time-to-live"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize the cache; a maxsize of 0 disables caching"""
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._data = TTLCache(maxsize=max(maxsize, 1), ttl=ttl)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value if it has not expired"""
+        return self._data.get(key, default)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        
+        self._data[key] = value
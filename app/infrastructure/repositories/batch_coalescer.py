@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.entities.product import Product
+from app.domain.repositories.product_repository import ProductRepository
+from app.config import get_settings
+
+
+class BatchCoalescer(ProductRepository):
+    """ProductRepository decorator that coalesces concurrent similarity searches.
+    
+    Calls to find_similar_products arriving within a short window are queued and
+    dispatched together through the wrapped repository's find_similar_products_batch,
+    so concurrent requests share one retrieve and one search_batch round-trip.
+    All other operations are delegated unchanged.
+    """
+    
+    def __init__(
+        self,
+        repository: ProductRepository,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """Initialize the coalescer around a product repository"""
+        settings = get_settings()
+        
+        self.repository = repository
+        self.max_batch_size = max_batch_size or settings.search_batch_max_size
+        self.max_wait = (max_wait_ms or settings.search_batch_wait_ms) / 1000
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Start the background task draining the request queue"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background task and fail any requests still queued"""
+        if self._worker is None:
+            return
+        
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        
+        while not self._queue.empty():
+            self._fail_stopped([self._queue.get_nowait()])
+    
+    async def save_product(self, product: Product) -> None:
+        """Save a product to the wrapped repository"""
+        await self.repository.save_product(product)
+    
+    async def batch_save_products(self, products: List[Product]) -> None:
+        """Save multiple products to the wrapped repository"""
+        await self.repository.batch_save_products(products)
+    
+    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        """Get a product by its ID from the wrapped repository"""
+        return await self.repository.get_product_by_id(product_id)
+    
+    async def find_similar_products(
+        self,
+        product_id: str,
+        limit: int = None,
+        distance_threshold: float = None
+    ) -> List[Dict[str, Any]]:
+        """Queue a similarity search and wait for its batch to be dispatched"""
+        if self._worker is None:
+            return await self.repository.find_similar_products(
+                product_id=product_id,
+                limit=limit,
+                distance_threshold=distance_threshold
+            )
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((product_id, limit, future))
+        return await future
+    
+    async def find_similar_products_batch(
+        self,
+        queries: List[Tuple[str, int]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Find similar products for several queries through the wrapped repository"""
+        return await self.repository.find_similar_products_batch(queries)
+    
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await self._dispatch(batch)
+            except asyncio.CancelledError:
+                # Requests already taken off the queue would otherwise never be resolved
+                self._fail_stopped(batch)
+                raise
+    
+    async def _dispatch(self, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Run one batched search and resolve each request's future with its result"""
+        queries = [(product_id, limit) for product_id, limit, _ in batch]
+        
+        try:
+            results = await self.repository.find_similar_products_batch(queries)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), similar_products in zip(batch, results):
+            if not future.done():
+                future.set_result(similar_products)
+    
+    @staticmethod
+    def _fail_stopped(batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Fail the unresolved requests of a batch because the coalescer stopped"""
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Batch coalescer stopped"))
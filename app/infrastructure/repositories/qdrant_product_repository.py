@@ -1,14 +1,29 @@
 import os
+import asyncio
 from typing import List, Optional, Dict, Any, Tuple
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 
 from app.domain.entities.product import Product
 from app.domain.repositories.product_repository import ProductRepository
+from app.infrastructure.cache.lru_cache import AsyncLRUCache
 from app.config import get_settings
 
 
+# Payload fields needed to build recommendation hits; unused fields are not sent back
+SEARCH_PAYLOAD_SELECTOR = models.PayloadSelectorInclude(
+    include=["product_id", "main_category", "sub_category", "price", "price_usd"]
+)
+
+# Search the INT8-quantized vectors held in RAM, then rescore the
+# oversampled candidates with the original vectors
+SEARCH_PARAMS = models.SearchParams(
+    hnsw_ef=64,
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+
 class QdrantProductRepository(ProductRepository):
     """Implementation of ProductRepository using Qdrant vector database"""
     
@@ -17,21 +32,45 @@ class QdrantProductRepository(ProductRepository):
         collection_name: Optional[str] = None,
         host: Optional[str] = None,
         port: Optional[int] = None,
-        vector_size: Optional[int] = None
+        grpc_port: Optional[int] = None,
+        vector_size: Optional[int] = None,
+        client: Optional[QdrantClient] = None,
+        async_client: Optional[AsyncQdrantClient] = None
     ):
-        """Initialize Qdrant repository"""
+        """Initialize Qdrant repository; pre-built clients may be passed in instead of connecting"""
         settings = get_settings()
         
         self.collection_name = collection_name or settings.qdrant_collection
         self.host = host or settings.qdrant_host
         self.port = port or settings.qdrant_port
+        self.grpc_port = grpc_port or settings.qdrant_grpc_port
         self.vector_size = vector_size or settings.vector_size
+        self.upsert_batch_size = settings.qdrant_upsert_batch_size
+        self.upsert_concurrency = settings.qdrant_upsert_concurrency
         
-        self.client = QdrantClient(host=self.host, port=self.port)
-        self._ensure_collection_exists()
+        # gRPC keeps a persistent HTTP/2 channel and avoids JSON-encoding vectors
+        self.client = client or QdrantClient(
+            host=self.host,
+            port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=settings.qdrant_prefer_grpc
+        )
+        # Bulk uploads go through the async client so they don't block the event loop
+        self.async_client = async_client or AsyncQdrantClient(
+            host=self.host,
+            port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=settings.qdrant_prefer_grpc
+        )
+        
+        # product_id -> (Product, embedding) for hot products
+        self._product_cache = AsyncLRUCache(maxsize=settings.product_cache_size)
     
-    def _ensure_collection_exists(self) -> None:
-        """Ensure the products collection exists, creating it if needed"""
+    def ensure_collection_exists(self) -> None:
+        """Ensure the products collection and its payload indexes exist, creating them if needed.
+        
+        Called once at application or pipeline startup rather than per instance.
+        """
         collections = self.client.get_collections().collections
         collection_names = [collection.name for collection in collections]
         
@@ -41,8 +80,38 @@ class QdrantProductRepository(ProductRepository):
                 vectors_config=models.VectorParams(
                     size=self.vector_size,
                     distance=models.Distance.COSINE
+                ),
+                hnsw_config=models.HnswConfigDiff(m=16, ef_construct=128),
+                quantization_config=models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        always_ram=True
+                    )
                 )
             )
+        
+        # Recommendations always filter on sub_category
+        self._ensure_payload_index("sub_category", models.PayloadSchemaType.KEYWORD)
+    
+    def _ensure_payload_index(self, field_name: str, field_schema: models.PayloadSchemaType) -> None:
+        """Create a payload index on the collection unless it already exists"""
+        payload_schema = self.client.get_collection(self.collection_name).payload_schema
+        
+        if field_name not in payload_schema:
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+    
+    def clear_cache(self) -> None:
+        """Drop all cached products, e.g. after the catalog is re-embedded"""
+        self._product_cache.clear()
+    
+    async def close(self) -> None:
+        """Close the underlying Qdrant client connections"""
+        self.client.close()
+        await self.async_client.close()
     
     def _product_to_point(self, product: Product) -> Tuple[str, List[float], Dict[str, Any]]:
         """Convert a product to a Qdrant point"""
@@ -77,6 +146,18 @@ class QdrantProductRepository(ProductRepository):
         
         return product, score
     
+    def _point_to_response_dict(self, payload: Dict[str, Any], score: float) -> Dict[str, Any]:
+        """Convert a search hit straight to a recommendation dict, skipping Product validation"""
+        return {
+            "product": {
+                "product_id": payload["product_id"],
+                "category": payload["main_category"],
+                "sub_category": payload["sub_category"],
+                "price": payload.get("price_usd") or payload["price"],
+            },
+            "distance": score
+        }
+    
     async def save_product(self, product: Product) -> None:
         """Save a product to Qdrant"""
         if not product.embedding:
@@ -84,6 +165,7 @@ class QdrantProductRepository(ProductRepository):
         
         point_id, vector, payload = self._product_to_point(product)
         
+        self._product_cache.invalidate(product.product_id)
         self.client.upsert(
             collection_name=self.collection_name,
             points=[
@@ -96,7 +178,12 @@ class QdrantProductRepository(ProductRepository):
         )
     
     async def batch_save_products(self, products: List[Product]) -> None:
-        """Save multiple products to Qdrant in a batch"""
+        """Save multiple products to Qdrant in concurrent chunked upserts.
+        
+        All chunks but the last are sent without waiting for them to be applied.
+        The last chunk is sent once the others are acknowledged and waits, so
+        every point is searchable when this returns.
+        """
         points = []
         
         for product in products:
@@ -112,27 +199,38 @@ class QdrantProductRepository(ProductRepository):
                 )
             )
         
-        if points:
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
+        chunks = [
+            points[start:start + self.upsert_batch_size]
+            for start in range(0, len(points), self.upsert_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.upsert_concurrency)
+        
+        async def upsert_chunk(chunk: List[models.PointStruct], wait: bool) -> None:
+            async with semaphore:
+                await self.async_client.upsert(
+                    collection_name=self.collection_name,
+                    points=chunk,
+                    wait=wait
+                )
+        
+        await asyncio.gather(*[upsert_chunk(chunk, wait=False) for chunk in chunks[:-1]])
+        # Updates are applied in order, so waiting on the last one waits for them all
+        if chunks:
+            await upsert_chunk(chunks[-1], wait=True)
+        
+        # Invalidate only once the new points are visible, so lookups in between can't re-cache stale ones
+        for product in products:
+            self._product_cache.invalidate(product.product_id)
     
     async def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get a product by its ID from Qdrant"""
         try:
-            points = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[product_id]
-            )
+            product_with_vector = await self._get_product_with_vector(product_id)
             
-            if not points:
+            if not product_with_vector:
                 return None
             
-            product, _ = self._point_to_product(
-                point_id=points[0].id, 
-                payload=points[0].payload
-            )
+            product, _ = product_with_vector
             
             return product
             
@@ -145,49 +243,159 @@ class QdrantProductRepository(ProductRepository):
         product_id: str, 
         limit: int = None,
         distance_threshold: float = None
-    ) -> List[Tuple[Product, float]]:
-        """Find similar products to the given product ID with similarity scores"""
+    ) -> List[Dict[str, Any]]:
+        """Find similar products to the given product ID as recommendation dicts with similarity scores"""
         settings = get_settings()
         limit = limit or settings.default_recommendation_limit
         distance_threshold = distance_threshold or settings.distance_threshold
         
-        product = await self.get_product_by_id(product_id)
-        if not product:
+        product_with_vector = await self._get_product_with_vector(product_id)
+        if not product_with_vector:
             return []
         
-        embedding = self.client.retrieve(
+        product, vector = product_with_vector
+        
+        search_result = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=vector,
+            limit=limit + 1,
+            query_filter=self._sub_category_filter(product.sub_category),
+            search_params=SEARCH_PARAMS,
+            with_payload=SEARCH_PAYLOAD_SELECTOR,
+            with_vectors=False
+        )
+        
+        return self._to_similar_products(product_id, search_result, limit)
+    
+    async def find_similar_products_batch(
+        self,
+        queries: List[Tuple[str, int]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Find similar products for several (product_id, limit) queries in one search_batch call"""
+        settings = get_settings()
+        queries = [
+            (product_id, limit or settings.default_recommendation_limit)
+            for product_id, limit in queries
+        ]
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not queries:
+            return results
+        
+        products_by_id: Dict[str, Tuple[Product, List[float]]] = {}
+        missing_ids = []
+        for product_id in dict.fromkeys(product_id for product_id, _ in queries):
+            cached = self._product_cache.get(product_id)
+            if cached is not None:
+                products_by_id[product_id] = cached
+            else:
+                missing_ids.append(product_id)
+        
+        if missing_ids:
+            points = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=missing_ids,
+                with_payload=True,
+                with_vectors=True
+            )
+            for point in points:
+                product, _ = self._point_to_product(point_id=point.id, payload=point.payload)
+                products_by_id[product.product_id] = (product, point.vector)
+                self._product_cache.set(product.product_id, (product, point.vector))
+        
+        groups: Dict[str, List[int]] = {}
+        for index, (product_id, _) in enumerate(queries):
+            if product_id in products_by_id:
+                product, _ = products_by_id[product_id]
+                groups.setdefault(product.sub_category, []).append(index)
+        
+        if not groups:
+            return results
+        
+        # Requests sharing a sub_category filter are kept adjacent so Qdrant
+        # can reuse the filtered candidate set across the batch.
+        positions = []
+        search_requests = []
+        for sub_category, indexes in groups.items():
+            filter_condition = self._sub_category_filter(sub_category)
+            for index in indexes:
+                product_id, limit = queries[index]
+                positions.append(index)
+                search_requests.append(
+                    models.SearchRequest(
+                        vector=products_by_id[product_id][1],
+                        filter=filter_condition,
+                        params=SEARCH_PARAMS,
+                        limit=limit + 1,
+                        with_payload=SEARCH_PAYLOAD_SELECTOR,
+                        with_vector=False
+                    )
+                )
+        
+        batch_result = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=search_requests
+        )
+        
+        for index, search_result in zip(positions, batch_result):
+            product_id, limit = queries[index]
+            results[index] = self._to_similar_products(product_id, search_result, limit)
+        
+        return results
+    
+    async def _get_product_with_vector(
+        self,
+        product_id: str
+    ) -> Optional[Tuple[Product, List[float]]]:
+        """Get a product and its embedding, served from cache when possible"""
+        return await self._product_cache.get_or_load(
+            product_id,
+            lambda: self._retrieve_product_with_vector(product_id)
+        )
+    
+    async def _retrieve_product_with_vector(
+        self,
+        product_id: str
+    ) -> Optional[Tuple[Product, List[float]]]:
+        """Retrieve a product's payload and embedding in a single Qdrant call"""
+        points = self.client.retrieve(
             collection_name=self.collection_name,
             ids=[product_id],
+            with_payload=True,
             with_vectors=True
         )
         
-        if not embedding:
-            return []
+        if not points:
+            return None
         
-        filter_condition = models.Filter(
+        product, _ = self._point_to_product(
+            point_id=points[0].id,
+            payload=points[0].payload
+        )
+        
+        return product, points[0].vector
+    
+    def _sub_category_filter(self, sub_category: str) -> models.Filter:
+        """Build the filter restricting a search to a single sub-category"""
+        return models.Filter(
             must=[
                 models.FieldCondition(
                     key="sub_category",
-                    match=models.MatchValue(value=product.sub_category)
+                    match=models.MatchValue(value=sub_category)
                 )
             ]
         )
-        
-        search_result = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=embedding[0].vector,
-            limit=limit + 1,
-            query_filter=filter_condition
-        )
-        
-        similar_products = []
-        for result in search_result:
-            if result.id != product_id:
-                product_obj, score = self._point_to_product(
-                    point_id=result.id,
-                    payload=result.payload,
-                    score=result.score
-                )
-                similar_products.append((product_obj, score))
+    
+    def _to_similar_products(
+        self,
+        product_id: str,
+        search_result: List[models.ScoredPoint],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Convert search hits to recommendation dicts, excluding the query product"""
+        similar_products = [
+            self._point_to_response_dict(payload=result.payload, score=result.score)
+            for result in search_result
+            if result.id != product_id
+        ]
         
         return similar_products[:limit]
\ No newline at end of file
@@ -1,19 +1,50 @@
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app.api.routes import recommendation
-from app.config import get_settings
 from app.config.environment import load_env_file
 
+# Settings are cached on first use, so the .env files must be loaded before
+# anything that may call get_settings() is imported
 load_env_file()
 
+from app.api.routes import cache, recommendation  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache  # noqa: E402
+from app.infrastructure.repositories.batch_coalescer import BatchCoalescer  # noqa: E402
+from app.infrastructure.repositories.qdrant_product_repository import QdrantProductRepository  # noqa: E402
+
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    app.state.product_repo = QdrantProductRepository()
+    app.state.product_repo.ensure_collection_exists()
+    
+    app.state.batch_coalescer = BatchCoalescer(app.state.product_repo)
+    await app.state.batch_coalescer.start()
+    
+    app.state.recommendation_cache = AsyncTTLCache(
+        maxsize=settings.recommendation_cache_size,
+        ttl=settings.recommendation_cache_ttl
+    )
+    
+    yield
+    
+    await app.state.batch_coalescer.stop()
+    await app.state.product_repo.close()
+
+
 app = FastAPI(
     title="Similar Product Recommendation Service",
     description="API for recommending similar products to users",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -24,7 +55,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 app.include_router(recommendation.router, tags=["recommendations"])
+app.include_router(cache.router, tags=["admin"])
 
 
 @app.get("/", tags=["status"])
@@ -2,6 +2,17 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+from pytest_asyncio import is_async_test
+
 # Add the project root directory to Python's path
 root_dir = Path(__file__).parent
-sys.path.insert(0, str(root_dir)) 
\ No newline at end of file
+sys.path.insert(0, str(root_dir))
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session-scoped event loop"""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
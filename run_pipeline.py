@@ -5,7 +5,7 @@ Script to run the product embedding pipeline using Prefect
 import asyncio
 import argparse
 
-from app.infrastructure.batch.embedding_pipeline import product_embedding_pipeline
+from app.infrastructure.batch.embedding_pipeline import get_embedding_model, product_embedding_pipeline
 
 
 def parse_args():
@@ -28,4 +28,5 @@ def parse_args():
 
 if __name__ == "__main__":
     args = parse_args()
+    get_embedding_model(args.model_name)
     asyncio.run(product_embedding_pipeline(csv_path=args.csv_path, model_name=args.model_name)) 
\ No newline at end of file
@@ -0,0 +1,11 @@
+import pytest
+
+# Import the application graph (FastAPI, Pydantic, Qdrant client) once per session
+# so the first test to touch it doesn't pay the import cost
+from app.main import app as fastapi_app
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Fixture for the FastAPI application"""
+    return fastapi_app
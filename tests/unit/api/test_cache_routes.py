@@ -0,0 +1,58 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+
+from app.api.routes.cache import invalidate_cache
+
+
+@pytest.fixture
+def request_with_caches():
+    """Fixture for a request whose app state holds mocked caches"""
+    state = SimpleNamespace(recommendation_cache=MagicMock(), product_repo=MagicMock())
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+@pytest.mark.asyncio
+async def test_invalidate_cache_clears_caches(request_with_caches):
+    """Test that invalidation clears both the recommendation and product caches"""
+    settings = SimpleNamespace(cache_invalidation_token="secret")
+    
+    with patch('app.api.routes.cache.get_settings', new=lambda: settings):
+        response = await invalidate_cache(request_with_caches, x_cache_invalidation_token="secret")
+    
+    state = request_with_caches.app.state
+    state.recommendation_cache.clear.assert_called_once()
+    state.product_repo.clear_cache.assert_called_once()
+    
+    assert response == {"status": "ok"}
+
+
+@pytest.mark.parametrize(
+    "configured_token, sent_token, expected_status",
+    [
+        (None, None, 403),
+        (None, "secret", 403),
+        ("secret", None, 401),
+        ("secret", "wrong", 401),
+    ]
+)
+@pytest.mark.asyncio
+async def test_invalidate_cache_rejects_missing_or_wrong_token(
+    request_with_caches,
+    configured_token,
+    sent_token,
+    expected_status
+):
+    """Test that invalidation requires the configured shared-secret header"""
+    settings = SimpleNamespace(cache_invalidation_token=configured_token)
+    
+    with patch('app.api.routes.cache.get_settings', new=lambda: settings):
+        with pytest.raises(HTTPException) as exc_info:
+            await invalidate_cache(request_with_caches, x_cache_invalidation_token=sent_token)
+    
+    state = request_with_caches.app.state
+    state.recommendation_cache.clear.assert_not_called()
+    state.product_repo.clear_cache.assert_not_called()
+    
+    assert exc_info.value.status_code == expected_status
@@ -1,18 +1,26 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 from app.application.use_cases.get_product_recommendations import GetProductRecommendationsUseCase
 from app.domain.entities.product import Product
-from app.domain.entities.recommendation import Recommendations
+from app.domain.entities.recommendation import ProductRecommendation, Recommendations
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache
+
+
+def resolves_to(value):
+    """Side effect making a MagicMock method return an awaitable of value"""
+    async def _resolve(*args, **kwargs):
+        return value
+    return _resolve
 
 
 @pytest.fixture
 def mock_product_repository():
     """Fixture for mocked product repository"""
-    return AsyncMock()
+    return MagicMock()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_product():
     """Fixture for a sample product"""
     return Product(
@@ -27,39 +35,68 @@ def sample_product():
     )
 
 
-@pytest.fixture
-def similar_products(sample_product):
-    """Fixture for similar products"""
-    similar_product1 = Product(
-        product_id="similar1",
-        product_name="Similar Product 1",
-        main_category="Electronics",
-        sub_category="Smartphones",
-        price="$649.99",
-        price_usd="$649.99",
-        ratings=4.3,
-        no_of_ratings=80
-    )
-    
-    similar_product2 = Product(
-        product_id="similar2",
-        product_name="Similar Product 2",
-        main_category="Electronics",
-        sub_category="Smartphones",
-        price="$699.99",
-        price_usd="$699.99",
-        ratings=4.7,
-        no_of_ratings=120
+@pytest.fixture(scope="session")
+def similar_products():
+    """Fixture for similar products as returned by the repository"""
+    return [
+        {
+            "product": {
+                "product_id": "similar1",
+                "category": "Electronics",
+                "sub_category": "Smartphones",
+                "price": "$649.99"
+            },
+            "distance": 0.85
+        },
+        {
+            "product": {
+                "product_id": "similar2",
+                "category": "Electronics",
+                "sub_category": "Smartphones",
+                "price": "$699.99"
+            },
+            "distance": 0.75
+        }
+    ]
+
+
+@pytest.fixture(scope="session")
+def expected_recommendations():
+    """Fixture for the recommendations expected for the sample similar products"""
+    return Recommendations(
+        results=[
+            ProductRecommendation(
+                product={
+                    "product_id": "similar1",
+                    "category": "Electronics",
+                    "sub_category": "Smartphones",
+                    "price": "$649.99"
+                },
+                distance=0.85
+            ),
+            ProductRecommendation(
+                product={
+                    "product_id": "similar2",
+                    "category": "Electronics",
+                    "sub_category": "Smartphones",
+                    "price": "$699.99"
+                },
+                distance=0.75
+            )
+        ]
     )
-    
-    return [(similar_product1, 0.85), (similar_product2, 0.75)]
 
 
 @pytest.mark.asyncio
-async def test_execute_with_valid_product_id(mock_product_repository, sample_product, similar_products):
+async def test_execute_with_valid_product_id(
+    mock_product_repository,
+    sample_product,
+    similar_products,
+    expected_recommendations
+):
     """Test use case execution with valid product ID"""
-    mock_product_repository.get_product_by_id.return_value = sample_product
-    mock_product_repository.find_similar_products.return_value = similar_products
+    mock_product_repository.get_product_by_id.side_effect = resolves_to(sample_product)
+    mock_product_repository.find_similar_products.side_effect = resolves_to(similar_products)
     
     use_case = GetProductRecommendationsUseCase(mock_product_repository)
     
@@ -71,26 +108,13 @@ async def test_execute_with_valid_product_id(mock_product_repository, sample_pro
         limit=2
     )
     
-    assert isinstance(result, Recommendations)
-    assert len(result.results) == 2
-    
-    assert result.results[0].product["product_id"] == "similar1"
-    assert result.results[0].product["category"] == "Electronics"
-    assert result.results[0].product["sub_category"] == "Smartphones"
-    assert result.results[0].product["price"] == "$649.99"
-    assert result.results[0].distance == 0.85
-    
-    assert result.results[1].product["product_id"] == "similar2"
-    assert result.results[1].product["category"] == "Electronics"
-    assert result.results[1].product["sub_category"] == "Smartphones"
-    assert result.results[1].product["price"] == "$699.99"
-    assert result.results[1].distance == 0.75
+    assert result == expected_recommendations.dict()
 
 
 @pytest.mark.asyncio
 async def test_execute_with_nonexistent_product_id(mock_product_repository):
     """Test use case execution with non-existent product ID"""
-    mock_product_repository.get_product_by_id.return_value = None
+    mock_product_repository.get_product_by_id.side_effect = resolves_to(None)
     
     use_case = GetProductRecommendationsUseCase(mock_product_repository)
     
@@ -105,8 +129,8 @@ async def test_execute_with_nonexistent_product_id(mock_product_repository):
 @pytest.mark.asyncio
 async def test_execute_with_default_limit(mock_product_repository, sample_product, similar_products):
     """Test use case execution with default limit"""
-    mock_product_repository.get_product_by_id.return_value = sample_product
-    mock_product_repository.find_similar_products.return_value = similar_products
+    mock_product_repository.get_product_by_id.side_effect = resolves_to(sample_product)
+    mock_product_repository.find_similar_products.side_effect = resolves_to(similar_products)
     
     use_case = GetProductRecommendationsUseCase(mock_product_repository)
     
@@ -118,4 +142,28 @@ async def test_execute_with_default_limit(mock_product_repository, sample_produc
         limit=5
     )
     
-    assert isinstance(result, Recommendations) 
\ No newline at end of file
+    assert isinstance(result, dict)
+
+
+@pytest.mark.asyncio
+async def test_execute_serves_repeated_requests_from_cache(mock_product_repository, sample_product, similar_products):
+    """Test that a cached recommendation is returned without querying the repository again"""
+    mock_product_repository.get_product_by_id.side_effect = resolves_to(sample_product)
+    mock_product_repository.find_similar_products.side_effect = resolves_to(similar_products)
+    
+    use_case = GetProductRecommendationsUseCase(
+        mock_product_repository,
+        recommendation_cache=AsyncTTLCache(maxsize=10, ttl=60)
+    )
+    
+    first = await use_case.execute(product_id="test123", limit=2)
+    second = await use_case.execute(product_id="test123", limit=2)
+    
+    mock_product_repository.get_product_by_id.assert_called_once_with("test123")
+    mock_product_repository.find_similar_products.assert_called_once_with(
+        product_id="test123",
+        limit=2
+    )
+    
+    assert first == {"results": similar_products}
+    assert second == first
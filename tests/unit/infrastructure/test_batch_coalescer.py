@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.infrastructure.repositories.batch_coalescer import BatchCoalescer
+
+
+def recommendation(product_id, distance):
+    """Build a recommendation dict as returned by the repository"""
+    return {
+        "product": {
+            "product_id": product_id,
+            "category": "Electronics",
+            "sub_category": "Smartphones",
+            "price": "$649.99"
+        },
+        "distance": distance
+    }
+
+
+@pytest.fixture
+def mock_repository():
+    """Fixture for mocked wrapped repository"""
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_are_dispatched_as_one_batch(mock_repository):
+    """Test that concurrent searches share a single batched repository call"""
+    mock_repository.find_similar_products_batch.return_value = [
+        [recommendation("similar1", 0.85)],
+        [],
+        [recommendation("similar2", 0.75)]
+    ]
+    
+    coalescer = BatchCoalescer(mock_repository, max_batch_size=64, max_wait_ms=10)
+    await coalescer.start()
+    
+    results = await asyncio.gather(
+        coalescer.find_similar_products("test123", limit=1),
+        coalescer.find_similar_products("nonexistent", limit=5),
+        coalescer.find_similar_products("test456", limit=1)
+    )
+    
+    await coalescer.stop()
+    
+    mock_repository.find_similar_products_batch.assert_called_once_with(
+        [("test123", 1), ("nonexistent", 5), ("test456", 1)]
+    )
+    mock_repository.find_similar_products.assert_not_called()
+    
+    assert results == [[recommendation("similar1", 0.85)], [], [recommendation("similar2", 0.75)]]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_split_at_max_batch_size(mock_repository):
+    """Test that a batch never exceeds the configured maximum size"""
+    mock_repository.find_similar_products_batch.side_effect = lambda queries: [[] for _ in queries]
+    
+    coalescer = BatchCoalescer(mock_repository, max_batch_size=2, max_wait_ms=10)
+    await coalescer.start()
+    
+    await asyncio.gather(*[
+        coalescer.find_similar_products(f"product{i}", limit=5) for i in range(3)
+    ])
+    
+    await coalescer.stop()
+    
+    batch_sizes = [len(call.args[0]) for call in mock_repository.find_similar_products_batch.call_args_list]
+    assert batch_sizes == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_error_is_propagated_to_each_request(mock_repository):
+    """Test that a failed batch call fails every request in the batch"""
+    mock_repository.find_similar_products_batch.side_effect = RuntimeError("qdrant unavailable")
+    
+    coalescer = BatchCoalescer(mock_repository, max_batch_size=64, max_wait_ms=10)
+    await coalescer.start()
+    
+    results = await asyncio.gather(
+        coalescer.find_similar_products("test123", limit=5),
+        coalescer.find_similar_products("test456", limit=5),
+        return_exceptions=True
+    )
+    
+    await coalescer.stop()
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_find_similar_products_without_worker_calls_repository(mock_repository):
+    """Test that searches go straight to the repository when the coalescer is not started"""
+    mock_repository.find_similar_products.return_value = [recommendation("similar1", 0.85)]
+    
+    coalescer = BatchCoalescer(mock_repository, max_batch_size=64, max_wait_ms=3)
+    
+    results = await coalescer.find_similar_products("test123", limit=1)
+    
+    mock_repository.find_similar_products.assert_called_once_with(
+        product_id="test123",
+        limit=1,
+        distance_threshold=None
+    )
+    mock_repository.find_similar_products_batch.assert_not_called()
+    
+    assert results == [recommendation("similar1", 0.85)]
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_requests_of_batch_in_flight(mock_repository):
+    """Test that stopping mid-dispatch fails the in-flight batch instead of leaving it pending"""
+    dispatched = asyncio.Event()
+    
+    async def never_returns(queries):
+        dispatched.set()
+        await asyncio.Event().wait()
+    
+    mock_repository.find_similar_products_batch.side_effect = never_returns
+    
+    coalescer = BatchCoalescer(mock_repository, max_batch_size=64, max_wait_ms=10)
+    await coalescer.start()
+    
+    request = asyncio.ensure_future(coalescer.find_similar_products("test123", limit=5))
+    await dispatched.wait()
+    await coalescer.stop()
+    
+    with pytest.raises(RuntimeError, match="Batch coalescer stopped"):
+        await asyncio.wait_for(request, timeout=1)
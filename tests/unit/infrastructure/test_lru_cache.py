@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.cache.lru_cache import AsyncLRUCache
+
+
+def test_set_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when the cache is full"""
+    cache = AsyncLRUCache(maxsize=2)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_zero_maxsize_disables_caching():
+    """Test that a cache with maxsize 0 stores nothing"""
+    cache = AsyncLRUCache(maxsize=0)
+    
+    cache.set("a", 1)
+    
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_runs_loader_once_for_concurrent_misses():
+    """Test that concurrent misses for the same key share a single load"""
+    cache = AsyncLRUCache(maxsize=10)
+    calls = []
+    
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "value"
+    
+    results = await asyncio.gather(*[cache.get_or_load("key", loader) for _ in range(5)])
+    
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.get("key") == "value"
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_none():
+    """Test that a loader returning None is retried on the next lookup"""
+    cache = AsyncLRUCache(maxsize=10)
+    
+    async def loader():
+        return None
+    
+    assert await cache.get_or_load("missing", loader) is None
+    assert "missing" not in cache
@@ -1,10 +1,12 @@
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 from app.domain.entities.product import Product
 from app.infrastructure.repositories.qdrant_product_repository import QdrantProductRepository
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_product():
     """Fixture for a sample product"""
     return Product(
@@ -23,26 +25,42 @@ def sample_product():
 @pytest.fixture
 def mock_qdrant_client():
     """Fixture for mocked qdrant client"""
-    mock_client = MagicMock()
-    mock_client.upsert = MagicMock()
-    mock_client.retrieve = MagicMock()
-    mock_client.search = MagicMock()
-    mock_client.get_collections = MagicMock()
-    return mock_client
+    return SimpleNamespace(
+        upsert=MagicMock(),
+        retrieve=MagicMock(),
+        search=MagicMock(),
+        search_batch=MagicMock(),
+        get_collections=MagicMock(),
+        get_collection=MagicMock(),
+        create_collection=MagicMock(),
+        create_payload_index=MagicMock(),
+        close=MagicMock()
+    )
+
+
+@pytest.fixture
+def mock_async_qdrant_client():
+    """Fixture for mocked async qdrant client"""
+    return SimpleNamespace(upsert=AsyncMock(), close=AsyncMock())
 
 
 @pytest.fixture
-def mock_repository(mock_qdrant_client):
+def mock_repository(mock_qdrant_client, mock_async_qdrant_client):
     """Fixture for mocked repository with dependency injection"""
-    with patch('app.infrastructure.repositories.qdrant_product_repository.QdrantClient', return_value=mock_qdrant_client):
-        repo = QdrantProductRepository(
-            collection_name="test_collection",
-            host="localhost",
-            port=6333,
-            vector_size=4
-        )
-        repo._ensure_collection_exists = MagicMock()
-        return repo
+    return QdrantProductRepository(
+        collection_name="test_collection",
+        host="localhost",
+        port=6333,
+        vector_size=4,
+        client=mock_qdrant_client,
+        async_client=mock_async_qdrant_client
+    )
+
+
+def test_init_does_not_check_collection(mock_repository):
+    """Test that constructing the repository does not issue a collection RPC"""
+    mock_repository.client.get_collections.assert_not_called()
+    mock_repository.client.create_collection.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -91,13 +109,14 @@ async def test_batch_save_products(mock_repository, sample_product):
     
     await mock_repository.batch_save_products([sample_product, product2])
     
-    client = mock_repository.client
+    client = mock_repository.async_client
     
     client.upsert.assert_called_once()
     
     call_args = client.upsert.call_args[1]
     
     assert call_args["collection_name"] == mock_repository.collection_name
+    assert call_args["wait"] is True
     
     assert len(call_args["points"]) == 2
     
@@ -111,79 +130,210 @@ async def test_batch_save_products(mock_repository, sample_product):
 
 
 @pytest.mark.asyncio
-async def test_get_product_by_id_found(mock_repository, sample_product):
-    """Test getting a product by ID when it exists"""
-    async def mock_get_product_implementation(product_id):
-        if product_id == sample_product.product_id:
-            return sample_product
-        return None
-    
-    with patch.object(mock_repository, 'get_product_by_id', side_effect=mock_get_product_implementation):
-        result = await mock_repository.get_product_by_id(sample_product.product_id)
-        
-        assert result is not None
-        assert result.product_id == sample_product.product_id
-        assert result.product_name == sample_product.product_name
+async def test_batch_save_products_in_chunks(mock_repository, sample_product):
+    """Test that batch saving splits the points into upsert chunks"""
+    products = [
+        sample_product.copy(update={"product_id": f"test{i}"})
+        for i in range(5)
+    ]
+    mock_repository.upsert_batch_size = 2
+    
+    await mock_repository.batch_save_products(products)
+    
+    client = mock_repository.async_client
+    
+    assert client.upsert.call_count == 3
+    chunk_ids = [
+        [point.id for point in call.kwargs["points"]]
+        for call in client.upsert.call_args_list
+    ]
+    assert chunk_ids == [["test0", "test1"], ["test2", "test3"], ["test4"]]
+    assert [call.kwargs["wait"] for call in client.upsert.call_args_list] == [False, False, True]
 
 
 @pytest.mark.asyncio
 async def test_get_product_by_id_not_found(mock_repository):
-    """Test getting a product by ID when it doesn't exist"""
-    async def mock_get_product_implementation(product_id):
-        return None
+    """Test getting a product by ID when Qdrant returns no point"""
+    mock_repository.client.retrieve.return_value = []
     
-    with patch.object(mock_repository, 'get_product_by_id', side_effect=mock_get_product_implementation):
-        result = await mock_repository.get_product_by_id("nonexistent")
-        
-        assert result is None
+    result = await mock_repository.get_product_by_id("nonexistent")
+    
+    assert result is None
+    assert mock_repository.client.retrieve.call_args[1]["ids"] == ["nonexistent"]
 
 
 @pytest.mark.asyncio
-async def test_find_similar_products(mock_repository, sample_product):
-    """Test finding similar products"""
-    similar_product1 = Product(
-        product_id="similar1",
-        product_name="Similar Product 1",
-        main_category="Electronics",
-        sub_category="Smartphones",
-        price="$649.99",
-        price_usd="$649.99",
-        ratings=4.3,
-        no_of_ratings=80,
-        embedding=[0.15, 0.25, 0.35, 0.45]
-    )
+async def test_find_similar_products_batch(mock_repository, sample_product):
+    """Test batched similarity search groups requests by sub-category in one search_batch call"""
+    laptop_payload = {
+        "product_id": "test456",
+        "product_name": "Test Product 2",
+        "main_category": "Electronics",
+        "sub_category": "Laptops",
+        "price": "$999.99",
+        "price_usd": "$999.99"
+    }
+    similar_payload = {
+        "product_id": "similar1",
+        "product_name": "Similar Product 1",
+        "main_category": "Electronics",
+        "sub_category": "Smartphones",
+        "price": "$649.99",
+        "price_usd": "$649.99"
+    }
     
-    similar_product2 = Product(
-        product_id="similar2",
-        product_name="Similar Product 2",
-        main_category="Electronics",
-        sub_category="Smartphones",
-        price="$699.99",
-        price_usd="$699.99",
-        ratings=4.7,
-        no_of_ratings=120,
-        embedding=[0.12, 0.22, 0.32, 0.42]
+    client = mock_repository.client
+    client.retrieve.return_value = [
+        MagicMock(id=sample_product.product_id, payload=sample_product.to_dict(), vector=sample_product.embedding),
+        MagicMock(id="test456", payload=laptop_payload, vector=[0.5, 0.6, 0.7, 0.8])
+    ]
+    client.search_batch.return_value = [
+        [
+            MagicMock(id=sample_product.product_id, payload=sample_product.to_dict(), score=1.0),
+            MagicMock(id="similar1", payload=similar_payload, score=0.85)
+        ],
+        [MagicMock(id="test456", payload=laptop_payload, score=1.0)]
+    ]
+    
+    results = await mock_repository.find_similar_products_batch(
+        [(sample_product.product_id, 2), ("nonexistent", 2), ("test456", 2)]
     )
     
-    async def mock_find_similar_implementation(product_id, limit=None, distance_threshold=None):
-        return [
-            (similar_product1, 0.85),
-            (similar_product2, 0.75)
-        ]
+    client.retrieve.assert_called_once()
+    assert client.retrieve.call_args[1]["ids"] == [sample_product.product_id, "nonexistent", "test456"]
+    assert client.retrieve.call_args[1]["with_vectors"] is True
+    
+    client.search_batch.assert_called_once()
+    requests = client.search_batch.call_args[1]["requests"]
+    assert len(requests) == 2
+    assert requests[0].vector == sample_product.embedding
+    assert requests[0].filter.must[0].match.value == "Smartphones"
+    assert requests[0].limit == 3
+    assert requests[1].filter.must[0].match.value == "Laptops"
+    assert "ratings" not in requests[0].with_payload.include
+    
+    assert len(results) == 3
+    
+    assert results[0] == [
+        {
+            "product": {
+                "product_id": "similar1",
+                "category": "Electronics",
+                "sub_category": "Smartphones",
+                "price": "$649.99"
+            },
+            "distance": 0.85
+        }
+    ]
+    
+    assert results[1] == []
+    assert results[2] == []
+
+
+@pytest.mark.asyncio
+async def test_find_similar_products_uses_cached_product(mock_repository, sample_product):
+    """Test that the query product is retrieved once and served from cache afterwards"""
+    similar_payload = {
+        "product_id": "similar1",
+        "product_name": "Similar Product 1",
+        "main_category": "Electronics",
+        "sub_category": "Smartphones",
+        "price": "$649.99",
+        "price_usd": "$649.99"
+    }
+    
+    client = mock_repository.client
+    client.retrieve.return_value = [
+        MagicMock(id=sample_product.product_id, payload=sample_product.to_dict(), vector=sample_product.embedding)
+    ]
+    client.search.return_value = [
+        MagicMock(id=sample_product.product_id, payload=sample_product.to_dict(), score=1.0),
+        MagicMock(id="similar1", payload=similar_payload, score=0.85)
+    ]
     
-    with patch.object(mock_repository, 'find_similar_products', side_effect=mock_find_similar_implementation):
+    for _ in range(2):
         results = await mock_repository.find_similar_products(
             product_id=sample_product.product_id,
-            limit=2,
-            distance_threshold=0.7
+            limit=2
         )
         
-        assert len(results) == 2
-        
-        product1, distance1 = results[0]
-        assert product1.product_id == similar_product1.product_id
-        assert distance1 == 0.85
-        
-        product2, distance2 = results[1]
-        assert product2.product_id == similar_product2.product_id
-        assert distance2 == 0.75 
\ No newline at end of file
+        assert len(results) == 1
+        assert results[0]["product"]["product_id"] == "similar1"
+        assert results[0]["distance"] == 0.85
+    
+    client.retrieve.assert_called_once()
+    call_args = client.retrieve.call_args[1]
+    assert call_args["ids"] == [sample_product.product_id]
+    assert call_args["with_payload"] is True
+    assert call_args["with_vectors"] is True
+    
+    assert client.search.call_count == 2
+    assert client.search.call_args[1]["query_vector"] == sample_product.embedding
+    assert client.search.call_args[1]["with_payload"].include == [
+        "product_id", "main_category", "sub_category", "price", "price_usd"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_product_then_find_similar_products_retrieves_once(mock_repository, sample_product):
+    """Test that looking up a product and searching from it share a single retrieve"""
+    client = mock_repository.client
+    client.retrieve.return_value = [
+        MagicMock(id=sample_product.product_id, payload=sample_product.to_dict(), vector=sample_product.embedding)
+    ]
+    client.search.return_value = []
+    
+    product = await mock_repository.get_product_by_id(sample_product.product_id)
+    results = await mock_repository.find_similar_products(product_id=sample_product.product_id, limit=2)
+    
+    assert product.product_id == sample_product.product_id
+    assert product.sub_category == sample_product.sub_category
+    assert results == []
+    
+    client.retrieve.assert_called_once()
+    assert client.retrieve.call_args[1]["with_vectors"] is True
+    assert client.search.call_args[1]["query_vector"] == sample_product.embedding
+
+
+def test_ensure_collection_exists_creates_quantized_collection(mock_repository):
+    """Test that a missing collection is created with HNSW tuning and scalar quantization"""
+    client = mock_repository.client
+    client.get_collections.return_value = MagicMock(collections=[])
+    client.get_collection.return_value = MagicMock(payload_schema={})
+    
+    mock_repository.ensure_collection_exists()
+    
+    client.create_collection.assert_called_once()
+    call_args = client.create_collection.call_args[1]
+    
+    assert call_args["collection_name"] == mock_repository.collection_name
+    assert call_args["vectors_config"].size == mock_repository.vector_size
+    assert call_args["hnsw_config"].m == 16
+    assert call_args["hnsw_config"].ef_construct == 128
+    assert call_args["quantization_config"].scalar.type == "int8"
+    assert call_args["quantization_config"].scalar.always_ram is True
+
+
+def test_ensure_collection_exists_creates_sub_category_index(mock_repository):
+    """Test that the sub_category payload index is created only when missing"""
+    client = mock_repository.client
+    collection = MagicMock()
+    collection.name = mock_repository.collection_name
+    client.get_collections.return_value = MagicMock(collections=[collection])
+    client.get_collection.return_value = MagicMock(payload_schema={})
+    
+    mock_repository.ensure_collection_exists()
+    
+    client.create_collection.assert_not_called()
+    client.create_payload_index.assert_called_once_with(
+        collection_name=mock_repository.collection_name,
+        field_name="sub_category",
+        field_schema="keyword"
+    )
+    
+    client.create_payload_index.reset_mock()
+    client.get_collection.return_value = MagicMock(payload_schema={"sub_category": MagicMock()})
+    
+    mock_repository.ensure_collection_exists()
+    
+    client.create_payload_index.assert_not_called()
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from cachetools import TTLCache
+
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache
+
+
+def test_entries_expire_after_ttl():
+    """Test that cached values are dropped once their time-to-live has passed"""
+    cache = AsyncTTLCache(maxsize=10, ttl=0.01)
+    
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    
+    time.sleep(0.02)
+    
+    assert cache.get("key") is None
+    assert "key" not in cache
+
+
+def test_clear_removes_all_entries():
+    """Test that clear drops every cached value"""
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_loaded_value():
+    """Test that a loaded value is served from cache on the next lookup"""
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = []
+    
+    async def loader():
+        calls.append(1)
+        return {"results": []}
+    
+    assert await cache.get_or_load(("test123", 5), loader) == {"results": []}
+    assert await cache.get_or_load(("test123", 5), loader) == {"results": []}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_never_returns_entry_expiring_mid_lookup():
+    """Test that an entry expiring between lookups is not returned as None"""
+    ticks = iter(range(1, 100))
+    cache = AsyncTTLCache(maxsize=10, ttl=1.5)
+    # Each timer read advances the clock, so the entry expires right after the first lookup
+    cache._data = TTLCache(maxsize=10, ttl=1.5, timer=lambda: next(ticks))
+    cache.set("key", "value")
+    
+    async def loader():
+        return "fresh"
+    
+    assert await cache.get_or_load("key", loader) is not None
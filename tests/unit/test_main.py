@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+# Prints the configured Qdrant host and the limit the route falls back to without ?limit=
+SETTINGS_PROBE = """
+import asyncio
+# Import the route before app.main, so nothing in it may read settings at import time
+from app.api.routes.recommendation import get_recommendation
+import app.main
+from app.config import get_settings
+
+class UseCase:
+    async def execute(self, product_id, limit):
+        self.limit = limit
+        return {"results": []}
+
+use_case = UseCase()
+asyncio.run(get_recommendation(product_id="test123", limit=None, use_case=use_case))
+print(get_settings().qdrant_host, use_case.limit)
+"""
+
+
+def test_environment_file_is_loaded_before_settings_are_cached(tmp_path):
+    """Test that the app and the recommendation route pick up values from .env.<APP_ENV>"""
+    (tmp_path / ".env.production").write_text("QDRANT_HOST=prod-qdrant\nDEFAULT_RECOMMENDATION_LIMIT=7\n")
+    
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("QDRANT_HOST", "DEFAULT_RECOMMENDATION_LIMIT")
+    }
+    env.update(APP_ENV="production", PYTHONPATH=str(ROOT_DIR))
+    
+    # A fresh interpreter, since this session has already imported and cached the settings
+    result = subprocess.run(
+        [sys.executable, "-c", SETTINGS_PROBE],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    
+    assert result.stdout.split() == ["prod-qdrant", "7"]